@@ -54,6 +54,9 @@ REDIS_FAKE = os.environ.get('REDIS_FAKE', False)
 
 Useful for testing, dev, beta."""
 
+REDIS_MAX_CONNECTIONS = os.environ.get('REDIS_MAX_CONNECTIONS', None)
+"""Maximum size of the Redis connection pool; unbounded if not set."""
+
 AUTH_SESSION_COOKIE_NAME = 'ARXIVNG_SESSION_ID'
 AUTH_SESSION_COOKIE_DOMAIN = os.environ.get('AUTH_SESSION_COOKIE_DOMAIN', f'.{BASE_SERVER}')
 AUTH_SESSION_COOKIE_SECURE = bool(int(os.environ.get('AUTH_SESSION_COOKIE_SECURE', '1')))
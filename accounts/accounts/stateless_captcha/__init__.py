@@ -70,6 +70,14 @@ def _secret(secret: str, ip_address: str) -> str:
     return ':'.join([secret, ip_address])
 
 
+def _parse_expires(expires: str) -> datetime:
+    """Parse the ``expires`` claim that :func:`new` writes."""
+    try:
+        return datetime.fromisoformat(expires)
+    except ValueError:      # Not from isoformat(); let dateutil try.
+        return dateutil.parser.parse(expires)
+
+
 def unpack(token: str, secret: str, ip_address: str) -> str:
     """
     Unpack a captcha token, and get the target value.
@@ -105,7 +113,7 @@ def unpack(token: str, secret: str, ip_address: str) -> str:
         raise InvalidCaptchaToken('Could not decode token')
     try:
         now = datetime.now(tz=UTC)
-        if dateutil.parser.parse(claims['expires']) <= now:
+        if _parse_expires(claims['expires']) <= now:
             logger.debug('captcha token expired: %s', claims['expires'])
             raise InvalidCaptchaToken('Expired token')
         value: str = claims['value']
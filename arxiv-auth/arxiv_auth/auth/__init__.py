@@ -1,6 +1,9 @@
 """Provides tools for working with authenticated user/client sessions."""
 
-from typing import Optional, Union, Any, List
+from typing import Optional, Any, List, Dict, Tuple
+from hashlib import blake2b
+import threading
+import time
 import warnings
 import os
 
@@ -69,6 +72,19 @@ class Auth(object):
         self.app = app
         app.config['arxiv_auth.Auth'] = self
 
+        # Legacy sessions are loaded from the classic DB. To avoid a DB round
+        # trip on every request, recently loaded sessions can be cached
+        # in-process by setting ``AUTH_LEGACY_CACHE_TTL`` to a number of
+        # seconds. The cache is off by default: a session that is logged out
+        # or invalidated in the DB keeps working for up to that many seconds
+        # in every process that has it cached.
+        self._legacy_cache_ttl = \
+            int(app.config.get('AUTH_LEGACY_CACHE_TTL', 0))
+        self._legacy_cache_size = \
+            int(app.config.get('AUTH_LEGACY_CACHE_SIZE', 10000))
+        self._legacy_cache: Dict[bytes, Tuple[float, str]] = {}
+        self._legacy_cache_lock = threading.Lock()
+
         if app.config.get('ARXIV_AUTH_DEBUG') or os.getenv('ARXIV_AUTH_DEBUG'):
             self.auth_debug()
             logger.debug("ARXIV_AUTH_DEBUG is set and auth debug messages to logging are turned on")
@@ -110,21 +126,24 @@ class Auth(object):
         cookie. Use of the NG `ARXIVNG_SESSION_ID` has never been implemented in
         this class.
         """
-        # Check the WSGI request environ for the ``session`` key, which
-        # is where the auth middleware puts any unpacked auth information from
-        # the request OR any exceptions that need to be raised withing the
-        # request context.
-        auth: Optional[Union[domain.Session, Exception]] = \
-            request.environ.get('auth')
+        # Check the WSGI request environ for the ``auth`` key, which is where
+        # the auth middleware puts any unpacked auth information from the
+        # request. Any exceptions that need to be raised within the request
+        # context are put on the ``auth_error`` key instead.
+        environ = request.environ
+        auth: Optional[domain.Session] = environ.get('auth')
 
         # Middlware may have passed an exception, which needs to be raised
         # within the app/execution context to be handled correctly.
-        if isinstance(auth, Exception):
-            logger.debug('Middleware passed an exception: %s', auth)
-            raise auth
+        error: Optional[Exception] = environ.get('auth_error')
+        if error is not None:
+            logger.debug('Middleware passed an exception: %s', error)
+            raise error
         elif auth:
             request.auth = auth
-        elif legacy.is_configured():
+        # We have the app already, so there's no need to go through the
+        # ``current_app`` proxy to get at its config.
+        elif legacy.is_configured(self.app.config):
             cookies = get_cookies(request, self.app.config['CLASSIC_COOKIE_NAME'])
             request.auth = self.first_valid(cookies)
         else:
@@ -158,17 +177,75 @@ class Auth(object):
         """
         if cookie_value is None:
             return None
+        # With the cache off (the default), we don't even hash the cookie.
+        key: Optional[bytes] = None
+        if self._legacy_cache_ttl:
+            key = blake2b(cookie_value.encode('utf-8'),
+                          digest_size=16).digest()
+            cached = self._get_cached_legacy_session(key)
+            if cached is not None:
+                return cached
         try:
             with legacy.transaction():
-                return legacy.sessions.load(cookie_value)
+                session: Optional[domain.Session] = \
+                    legacy.sessions.load(cookie_value)
         except legacy.exceptions.UnknownSession as e:
             logger.debug('No legacy session available: %s', e)
         except legacy.exceptions.InvalidCookie as e:
             logger.debug('Invalid legacy cookie: %s', e)
         except legacy.exceptions.SessionExpired as e:
             logger.debug('Legacy session is expired: %s', e)
+        else:
+            if key is not None:
+                self._cache_legacy_session(key, session)
+            return session
+        if key is not None:
+            self._evict_legacy_session(key)
         return None
 
+    def _get_cached_legacy_session(self, key: bytes) \
+            -> Optional[domain.Session]:
+        """Get a cached legacy session, if it is still fresh."""
+        with self._legacy_cache_lock:
+            entry = self._legacy_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            self._evict_legacy_session(key)
+            return None
+        # Each request gets its own session, built from the cached JSON. This
+        # is several times cheaper than a deep copy of a cached Session.
+        return domain.Session.model_validate_json(payload)
+
+    def _cache_legacy_session(self, key: bytes,
+                              session: Optional[domain.Session]) -> None:
+        """Cache a legacy session loaded from the database."""
+        if session is None:
+            return
+        now = time.time()
+        expires_at = now + self._legacy_cache_ttl
+        if session.end_time is not None:
+            # Never serve a session from the cache after it has ended.
+            expires_at = min(expires_at, session.end_time.timestamp())
+        if expires_at <= now:
+            return
+        entry = (expires_at, session.model_dump_json())
+        with self._legacy_cache_lock:
+            if len(self._legacy_cache) >= self._legacy_cache_size:
+                for stale in [k for k, (exp, _) in self._legacy_cache.items()
+                              if exp <= now]:
+                    del self._legacy_cache[stale]
+            if len(self._legacy_cache) >= self._legacy_cache_size:
+                # Dicts preserve insertion order, so this is the oldest entry.
+                del self._legacy_cache[next(iter(self._legacy_cache))]
+            self._legacy_cache[key] = entry
+
+    def _evict_legacy_session(self, key: bytes) -> None:
+        """Remove a legacy session from the cache."""
+        with self._legacy_cache_lock:
+            self._legacy_cache.pop(key, None)
+
     def auth_debug(self) -> None:
         """Sets several auth loggers to DEBUG.
 
@@ -88,6 +88,8 @@ from .. import domain
 INVALID_TOKEN = {'reason': 'Invalid authorization token'}
 INVALID_SCOPE = {'reason': 'Token not authorized for this action'}
 
+_MISSING = object()
+
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
@@ -138,6 +140,109 @@ def scoped(required: Optional[domain.Scope] = None,
     """
     if required and not isinstance(required, domain.Scope):
         required = domain.Scope(required)
+    if required:
+        # The scopes that we look for depend only on ``required``, so we work
+        # them out once here rather than splitting and rebuilding ``required``
+        # on every request.
+        global_scope = required.as_global()
+        resource_prefix = required.for_resource('')
+
+    # Bind names used on every request as closure variables, so that the
+    # wrapper doesn't need to look them up in the module globals (or on the
+    # logger) each time it is called.
+    _Unauthorized, _Forbidden, _debug = Unauthorized, Forbidden, logger.debug
+
+    def _check_scopes(scopes: List[domain.Scope], args: tuple,
+                      kwargs: dict) -> Optional[bool]:
+        """
+        Check the session scopes against the required scope.
+
+        Returns ``True`` if the request is authorized by a global or
+        resource-specific scope, ``None`` if only the generic scope is present
+        (so an authorizer may still have its say), and ``False`` if the
+        required scope is not present at all.
+        """
+        # A global scope is usually granted to administrators, or perhaps
+        # moderators (e.g. view submission content).
+        # For example: `submission:read:*`.
+        if global_scope in scopes:
+            _debug('Authorized with global scope')
+            return True
+
+        # A resource-specific scope may be granted at the auth layer. For
+        # example, an admin may provide provisional access to a specific
+        # resource for a specific role. This kind of authorization is only
+        # supported if the service provides a ``resource()`` callback to get
+        # the resource identifier.
+        if resource is not None and (
+                resource_prefix + str(resource(*args, **kwargs)) in scopes):
+            _debug('Authorized by specific resource')
+            return True
+
+        # If both the global and resource-specific scope authorization fail,
+        # then we look for the general scope in the session.
+        if required in scopes:
+            _debug('Required scope is present')
+            return None
+
+        # The required scope is not present. There is nothing left to check.
+        _debug('Required scope is not present')
+        return False
+
+    # Which of the checks below applies depends only on the arguments to
+    # scoped(), so we pick one here rather than branching on every request.
+    def _scope_and_authorizer(session: domain.Session,
+                              scopes: List[domain.Scope], args: tuple,
+                              kwargs: dict) -> bool:
+        """Check the required scope, then defer to the authorizer."""
+        if not scopes:
+            _debug('Calling authorizer callback')
+            return bool(authorizer(session, *args, **kwargs))
+        authorized = _check_scopes(scopes, args, kwargs)
+        if authorized is None:
+            # If an authorizer callback is provided by the service, then we
+            # will enforce whatever it returns.
+            authorized = authorizer(session, *args, **kwargs)
+            _debug('Authorizer func returned %s', authorized)
+        return bool(authorized)
+
+    def _scope_only(session: domain.Session, scopes: List[domain.Scope],
+                    args: tuple, kwargs: dict) -> bool:
+        """Check the required scope."""
+        if not scopes:
+            _debug('No authorization path available')
+            return False
+        authorized = _check_scopes(scopes, args, kwargs)
+        if authorized is None:
+            # If no authorizer callback is provided, it is implied that the
+            # general scope is sufficient to authorize the request.
+            _debug('No authorizer func provided')
+            return True
+        return authorized
+
+    def _authorizer_only(session: domain.Session, scopes: List[domain.Scope],
+                         args: tuple, kwargs: dict) -> bool:
+        """Rely entirely on the authorizer callback."""
+        _debug('Calling authorizer callback')
+        return bool(authorizer(session, *args, **kwargs))
+
+    def _no_check(session: domain.Session, scopes: List[domain.Scope],
+                  args: tuple, kwargs: dict) -> bool:
+        """Nothing is required, so the request is authorized."""
+        _debug('No scope required, no authorizer function;'
+               ' request is authorized.')
+        return True
+
+    authorize: Callable[[domain.Session, List[domain.Scope], tuple, dict],
+                        bool]
+    if required and authorizer is not None:
+        authorize = _scope_and_authorizer
+    elif required:
+        authorize = _scope_only
+    elif authorizer is not None:
+        authorize = _authorizer_only
+    else:
+        authorize = _no_check
 
     def protector(func: Callable) -> Callable:
         """Decorator that provides scope enforcement."""
@@ -157,92 +262,34 @@ def scoped(required: Optional[domain.Scope] = None,
                 provided authorizer returns ``False``.
 
             """
-            if hasattr(request, 'auth'):
-                session = request.auth
-            elif hasattr(request, 'session'):
-                session = request.session
-            else:
-                raise Unauthorized('No active session on request')
+            # ``request`` is a proxy, so we look each attribute up only once.
+            session = getattr(request, 'auth', _MISSING)
+            if session is _MISSING:
+                session = getattr(request, 'session', _MISSING)
+                if session is _MISSING:
+                    raise _Unauthorized('No active session on request')
             scopes: List[domain.Scope] = []
-            authorized: bool = False
-            logger.debug('Required: %s, authorizer: %s, unauthorized: %s',
-                         required, authorizer, unauthorized)
+            _debug('Required: %s, authorizer: %s, unauthorized: %s',
+                   required, authorizer, unauthorized)
             # Use of the decorator implies that an auth session ought to be
             # present. So we'll complain here if it's not.
             if not session or not (session.user or session.client):
-                logger.debug('No valid session; aborting')
+                _debug('No valid session; aborting')
                 if unauthorized is not None:
                     response = unauthorized(*args, **kwargs)
                     if response is not None:
                         return response
-                raise Unauthorized('Not a valid session')
+                raise _Unauthorized('Not a valid session')
 
             if session.authorizations is not None:
                 scopes = session.authorizations.scopes
-                logger.debug('session has scopes: %s', scopes)
-
-            # If a required scope is provided, we first check to see whether
-            # the session globally or explicitly authorizes the request. We
-            # then fall back to the locally-defined authorizer function if it
-            # is provided.
-            if required and scopes:
-                # A global scope is usually granted to administrators, or
-                # perhaps moderators (e.g. view submission content).
-                # For example: `submission:read:*`.
-                if required.as_global() in scopes:
-                    logger.debug('Authorized with global scope')
-                    authorized = True
-
-                # A resource-specific scope may be granted at the auth layer.
-                # For example, an admin may provide provisional access to a
-                # specific resource for a specific role. This kind of
-                # authorization is only supported if the service provides a
-                # ``resource()`` callback to get the resource identifier.
-                elif (resource is not None
-                      and (
-                        required.for_resource(str(resource(*args, **kwargs)))
-                        in scopes)):
-                    logger.debug('Authorized by specific resource')
-                    authorized = True
-
-                # If both the global and resource-specific scope authorization
-                # fail, then we look for the general scope in the session.
-                elif required in scopes:
-                    logger.debug('Required scope is present')
-                    # If an authorizer callback is provided by the service,
-                    # then we will enforce whatever it returns.
-                    if authorizer:
-                        authorized = authorizer(session, *args, **kwargs)
-                        logger.debug('Authorizer func returned %s', authorized)
-                    # If no authorizer callback is provided, it is implied that
-                    # the general scope is sufficient to authorize the request.
-                    elif authorizer is None:
-                        logger.debug('No authorizer func provided')
-                        authorized = True
-                # The required scope is not present. There is nothing left to
-                # check.
-                else:
-                    logger.debug('Required scope is not present')
-                    authorized = False
-
-            elif required is None and authorizer is None:
-                logger.debug('No scope required, no authorizer function;'
-                             ' request is authorized.')
-                authorized = True
-
-            # If a specific scope is not required, we rely entirely on the
-            # authorizer callback.
-            elif authorizer is not None:
-                logger.debug('Calling authorizer callback')
-                authorized = authorizer(session, *args, **kwargs)
-            else:
-                logger.debug('No authorization path available')
-
-            if not authorized:
-                logger.debug('Session is not authorized')
-                raise Forbidden('Access denied')
-
-            logger.debug('Request is authorized, proceeding')
+                _debug('session has scopes: %s', scopes)
+
+            if not authorize(session, scopes, args, kwargs):
+                _debug('Session is not authorized')
+                raise _Forbidden('Access denied')
+
+            _debug('Request is authorized, proceeding')
             return func(*args, **kwargs)
         return wrapper
     return protector
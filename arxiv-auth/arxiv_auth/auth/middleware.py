@@ -34,6 +34,9 @@ For convenience, this is intended to be used with
 """
 
 import os
+import json
+import binascii
+from base64 import urlsafe_b64decode
 from typing import Callable, Iterable, Tuple
 import jwt
 import logging
@@ -50,6 +53,30 @@ logger = logging.getLogger(__name__)
 
 WSGIRequest = Tuple[dict, Callable]
 
+_ALLOWED_ALGS = frozenset({'HS256'})
+"""Signing algorithms that we accept on auth tokens."""
+
+
+def _check_algorithm(token: str) -> None:
+    """
+    Reject a token whose header does not declare an allowed algorithm.
+
+    Only the (short) header segment is decoded, so malformed tokens and tokens
+    using e.g. ``alg: none`` are rejected before any signature verification.
+
+    Raises
+    ------
+    :class:`InvalidToken`
+
+    """
+    header, _, _ = token.partition('.')
+    try:
+        alg = json.loads(urlsafe_b64decode(header + '===')).get('alg')
+    except (ValueError, binascii.Error, AttributeError) as e:
+        raise InvalidToken('Token header is malformed') from e
+    if alg not in _ALLOWED_ALGS:
+        raise InvalidToken(f'Token algorithm not allowed: {alg}')
+
 
 class AuthMiddleware(BaseMiddleware):
     """
@@ -61,20 +88,22 @@ class AuthMiddleware(BaseMiddleware):
     to the request.
 
     This can be accessed in the application via
-    ``flask.request.environ['session']``.  If Authorization header was not
+    ``flask.request.environ['auth']``.  If Authorization header was not
     included, then that value will be ``None``.
 
-    If the JWT could not be  decrypted, the value will be an
-    :class:`Unauthorized` exception instance. We cannot raise the exception
-    here, because the middleware is executed outside of the Flask application.
-    It's up to something running inside the application (e.g.
-    :func:`arxiv.users.auth.decorators.scoped`) to raise the exception.
+    If the JWT could not be  decrypted, ``environ['auth']`` will be ``None``
+    and ``environ['auth_error']`` will be an :class:`Unauthorized` exception
+    instance. We cannot raise the exception here, because the middleware is
+    executed outside of the Flask application. It's up to something running
+    inside the application (e.g. :meth:`arxiv_auth.auth.Auth.load_session`)
+    to raise the exception.
 
     """
 
     def before(self, environ: dict, start_response: Callable) -> WSGIRequest:
         """Decode and unpack the auth token on the request."""
         environ['auth'] = None      # Create the session key, at a minimum.
+        environ['auth_error'] = None
         environ['token'] = None
         token = environ.get('HTTP_AUTHORIZATION')    # We may not have a token.
         if token is None:
@@ -89,17 +118,18 @@ class AuthMiddleware(BaseMiddleware):
         try:
             # Try to verify the token in the Authorization header, and attach
             # the decoded session data to the request.
+            _check_algorithm(token)
             session: domain.Session = tokens.decode(token, secret)
             environ['auth'] = session
 
             # Attach the encrypted token so that we can use it in subrequests.
             environ['token'] = token
         except InvalidToken as e:   # Let the application decide what to do.
-            logger.debug(f'Auth token not valid: {token}')
+            logger.debug('Auth token not valid: %s', token)
             exception = Unauthorized('Invalid auth token')
-            environ['auth'] = exception
+            environ['auth_error'] = exception
         except Exception as e:
             logger.error(f'Unhandled exception: {e}')
             exception = InternalServerError(f'Unhandled: {e}')  # type: ignore
-            environ['auth'] = exception
+            environ['auth_error'] = exception
         return environ, start_response
@@ -150,7 +150,7 @@ READ_PREVIEW = _scope_str(domains.PREVIEW, actions.READ)
 CREATE_PREVIEW = _scope_str(domains.PREVIEW, actions.CREATE)
 """Can create a new submission preview."""
 
-GENERAL_USER = [
+GENERAL_USER_ORDERED = (
     READ_PUBLIC,    # Access to public APIs.
 
     # Profile management.
@@ -175,15 +175,23 @@ GENERAL_USER = [
     # Ability to create and view submission previews.
     READ_PREVIEW,
     CREATE_PREVIEW,
-]
+)
+"""
+The default scopes afforded to an authenticated user, in a stable order.
+
+Use this where the order of the scopes matters, e.g. when building the scope
+list attached to a session.
+"""
+
+GENERAL_USER = frozenset(GENERAL_USER_ORDERED)
 """
 The default scopes afforded to an authenticated user.
 
-This static list will be deprecated by role-based access control (RBAC) at a
+This static set will be deprecated by role-based access control (RBAC) at a
 later milestone of arXiv.
 """
 
-_ADMIN_USER = GENERAL_USER + [
+_ADMIN_USER = GENERAL_USER_ORDERED + (
     CREATE_UPLOAD_CHECKPOINT,
     DELETE_UPLOAD_CHECKPOINT,
     READ_UPLOAD_CHECKPOINT,
@@ -193,7 +201,7 @@ _ADMIN_USER = GENERAL_USER + [
     DELETE_UPLOAD_WORKSPACE,
     READ_UPLOAD_LOGS,
     READ_UPLOAD_SERVICE_LOGS
-]
+)
 ADMIN_USER = [str(Scope.from_str(scope).as_global()) for scope in _ADMIN_USER]
 """
 Scopes afforded to an administrator.
@@ -5,19 +5,34 @@ Used to create, delete, and verify user and client session.
 """
 
 import uuid
-import random
+import secrets
+import hmac
+import hashlib
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+import threading
+import time
+import math
+from functools import lru_cache
+from collections import OrderedDict
 from datetime import datetime, timedelta
 import dateutil.parser
 from pytz import timezone, UTC
 import logging
 
-from typing import Optional, Union
+from typing import Optional, Union, Tuple, Iterable, Dict, Any, List, \
+    NamedTuple, Mapping
 
 import redis
 import rediscluster
 
 import jwt
 
+try:
+    import orjson
+except ImportError:     # pragma: no cover
+    orjson = None
+    import json
+
 from arxiv_auth.auth import domain
 from ..exceptions import SessionCreationFailed, InvalidToken, \
     SessionDeletionFailed, UnknownSession, ExpiredToken
@@ -27,9 +42,264 @@ from arxiv.base.globals import get_application_config, get_application_global
 logger = logging.getLogger(__name__)
 EASTERN = timezone('US/Eastern')
 
+_COOKIE_CACHE_SIZE = 4096
+"""Maximum number of decoded session cookies to keep in memory."""
+
+_cookie_cache: 'OrderedDict[tuple, Tuple[float, dict]]' = \
+    OrderedDict()
+_cookie_cache_lock = threading.Lock()
+
+_signed_cookie_cache: 'OrderedDict[tuple, str]' = \
+    OrderedDict()
+_signed_cookie_cache_lock = threading.Lock()
+
+_ALGORITHMS = ['HS256']
+"""The only algorithm that we use (and accept) to sign sessions and cookies."""
+
+_DECODE_OPTIONS = {
+    'verify_exp': False,
+    'verify_nbf': False,
+    'verify_iat': False,
+    'verify_aud': False,
+    'verify_iss': False,
+    'verify_sub': False,
+    'verify_jti': False,
+}
+"""Cookies carry their own ``expires`` claim, so PyJWT's checks don't apply."""
+
+_MIN_COOKIE_LENGTH = 20
+_MAX_COOKIE_LENGTH = 8192
+"""Bounds on the length of a plausible session cookie."""
+
+def _b64url(data: bytes) -> bytes:
+    """Encode ``data`` as unpadded base64url, as used in JWTs."""
+    return urlsafe_b64encode(data).rstrip(b'=')
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    """Decode unpadded base64url."""
+    return urlsafe_b64decode(data + b'=' * (-len(data) % 4))
+
+
+_HEADER = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+"""The (constant) encoded JOSE header of our session records and cookies."""
+
+_jws = jwt.PyJWS(algorithms=_ALGORITHMS)
+"""Signs and verifies session records; set up once, rather than per call."""
+
+_redis_clients: Dict[tuple, Any] = {}
+_redis_clients_lock = threading.Lock()
+
+_session_stores: Dict[tuple, 'SessionStore'] = {}
+
+_CONFIG_KEYS = ('REDIS_HOST', 'REDIS_PORT', 'REDIS_DATABASE', 'REDIS_TOKEN',
+                'REDIS_CLUSTER', 'JWT_SECRET', 'SESSION_DURATION',
+                'REDIS_FAKE', 'REDIS_MAX_CONNECTIONS')
+"""The application config parameters that determine a :class:`SessionStore`."""
+
+
+class SessionConfig(NamedTuple):
+    """Settings for a :class:`SessionStore`, read from the app config."""
+
+    host: str
+    port: int
+    db: int
+    secret: str
+    duration: int
+    token: Optional[str]
+    cluster: bool
+    fake: bool
+    max_connections: Optional[int]
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> 'SessionConfig':
+        """Read and normalize the settings from an application config."""
+        max_connections = config.get('REDIS_MAX_CONNECTIONS', None)
+        return cls(
+            host=config.get('REDIS_HOST', 'localhost'),
+            port=int(config.get('REDIS_PORT', '7000')),
+            db=int(config.get('REDIS_DATABASE', '0')),
+            secret=config['JWT_SECRET'],
+            duration=int(config.get('SESSION_DURATION', '7200')),
+            token=config.get('REDIS_TOKEN', None),
+            # Accept a bool as well as the '1'/'0' strings from the env.
+            cluster=str(config.get('REDIS_CLUSTER', '1')).lower()
+            in ('1', 'true'),
+            fake=config.get('REDIS_FAKE', False),
+            max_connections=None if max_connections is None
+            else int(max_connections)
+        )
+
 
 def _generate_nonce(length: int = 8) -> str:
-    return ''.join([str(random.randint(0, 9)) for i in range(length)])
+    # The nonce is used to detect forged cookies, so it should come from a
+    # cryptographically secure source.
+    return f'{secrets.randbelow(10 ** length):0{length}d}'
+
+
+def _dumps_session(session: domain.Session) -> bytes:
+    """Serialize a session as JSON."""
+    if orjson is not None:
+        # orjson serializes datetimes natively, as ISO-8601.
+        return orjson.dumps(session.model_dump())
+    return json.dumps(session.json_safe_dict(),
+                      separators=(',', ':')).encode('utf-8')
+
+
+def _dumps_claims(claims: dict) -> bytes:
+    """Serialize cookie claims as compact JSON, just as PyJWT would."""
+    if orjson is not None:
+        return orjson.dumps(claims)
+    return json.dumps(claims, separators=(',', ':')).encode('utf-8')
+
+
+def _loads_claims(raw: bytes) -> dict:
+    """Deserialize cookie claims from JSON."""
+    claims = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    if not isinstance(claims, dict):
+        raise ValueError('Claims must be a JSON object')
+    return claims
+
+
+def _loads_session(raw: Union[str, bytes]) -> domain.Session:
+    """Deserialize a session from JSON."""
+    # Validating straight from JSON lets pydantic's compiled core parse and
+    # build the session in one pass, rather than building an intermediate
+    # dict and then walking it again.
+    return domain.Session.model_validate_json(raw)
+
+
+def _parse_expires(expires: str) -> datetime:
+    """Parse an ISO-8601 ``expires`` claim of a session cookie."""
+    # We write this claim ourselves with ``isoformat()``, so the (much
+    # faster) stdlib parser should always work. We fall back to dateutil for
+    # anything unexpected.
+    try:
+        return datetime.fromisoformat(expires)
+    except ValueError:
+        return dateutil.parser.parse(expires)
+
+
+@lru_cache(maxsize=_COOKIE_CACHE_SIZE, typed=True)
+def _expires_at(expires: Union[str, int, float]) -> float:
+    """
+    Get the ``expires`` claim of a session cookie as a UNIX timestamp.
+
+    Raises :class:`ValueError` if the claim is not a valid, finite time.
+    """
+    # We also accept a UNIX timestamp, which needs no parsing at all. This
+    # lets us switch the claim over to timestamps once every reader of our
+    # cookies understands them.
+    if isinstance(expires, (int, float)) and not isinstance(expires, bool):
+        timestamp = float(expires)
+        if not math.isfinite(timestamp):
+            raise ValueError(f'Not a valid expiry: {expires!r}')
+        return timestamp
+    # Every request in a session carries the same claim, so we parse each
+    # one only once.
+    try:
+        return _parse_expires(expires).timestamp()
+    except (OverflowError, OSError) as e:
+        raise ValueError(f'Expiry out of range: {expires!r}') from e
+
+
+def _get_cached_cookie(key: Tuple[str, Union[str, bytes]]) \
+        -> Optional[dict]:
+    """Get previously decoded cookie data, if it has not yet expired."""
+    with _cookie_cache_lock:
+        entry = _cookie_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del _cookie_cache[key]
+            return None
+        _cookie_cache.move_to_end(key)
+    # Callers get their own copy, so that they can't alter the cached data.
+    return dict(entry[1])
+
+
+def _cache_cookie(key: Tuple[str, Union[str, bytes]],
+                  cookie_data: dict) -> None:
+    """Keep decoded cookie data until the cookie expires."""
+    try:
+        expires_at = _expires_at(cookie_data['expires'])
+    except (KeyError, TypeError, ValueError):
+        return      # Let load() deal with the malformed claim.
+    if expires_at <= time.time():
+        return
+    with _cookie_cache_lock:
+        _cookie_cache[key] = (expires_at, dict(cookie_data))
+        _cookie_cache.move_to_end(key)
+        while len(_cookie_cache) > _COOKIE_CACHE_SIZE:
+            _cookie_cache.popitem(last=False)
+
+
+def _get_signed_cookie(key: tuple) -> Optional[str]:
+    """Get a cookie that we already signed for the same claims."""
+    with _signed_cookie_cache_lock:
+        cookie = _signed_cookie_cache.get(key)
+        if cookie is not None:
+            _signed_cookie_cache.move_to_end(key)
+        return cookie
+
+
+def _cache_signed_cookie(key: tuple, cookie: str) -> None:
+    """Remember a signed cookie, so that it needn't be signed again."""
+    with _signed_cookie_cache_lock:
+        _signed_cookie_cache[key] = cookie
+        _signed_cookie_cache.move_to_end(key)
+        while len(_signed_cookie_cache) > _COOKIE_CACHE_SIZE:
+            _signed_cookie_cache.popitem(last=False)
+
+
+def _new_redis_client(host: str, port: int, cluster: bool, fake: bool,
+                      db: int = 0, max_connections: Optional[int] = None) \
+        -> Any:
+    """Open a new connection to Redis."""
+    if fake:
+        logger.warning('Using FakeRedis')
+        import fakeredis # this is a dev dependency needed during testing
+        return fakeredis.FakeStrictRedis()
+    # redis-py (and so redis-py-cluster) parses replies with hiredis when it
+    # is installed (see the ``fast`` extra), and falls back to pure Python.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('New Redis connection at %s, port %s, using %s', host,
+                     port, redis.connection.DefaultParser.__name__)
+    if cluster:
+        return rediscluster.StrictRedisCluster(
+            startup_nodes=[{'host': host, 'port': str(port)}],
+            skip_full_coverage_check=True,
+            max_connections=max_connections
+        )
+    # Redis Cluster only has database 0, so ``db`` applies to a single node.
+    return redis.StrictRedis(host=host, port=port, db=db,
+                             max_connections=max_connections)
+
+
+def get_redis_client(host: str, port: int, cluster: bool = True,
+                     fake: bool = False, db: int = 0,
+                     max_connections: Optional[int] = None) -> Any:
+    """
+    Get the Redis client for this process.
+
+    Redis clients are thread safe, and keep their own connection pool. So
+    rather than opening a new connection (and, for a cluster, rediscovering
+    the cluster slots) for each app context, we create one client per
+    configuration and share it for the life of the process.
+
+    ``max_connections`` bounds the size of the client's connection pool (per
+    node, for a cluster); by default it is unbounded.
+    """
+    key = (host, port, cluster, fake, db, max_connections)
+    client = _redis_clients.get(key)
+    if client is None:
+        with _redis_clients_lock:
+            client = _redis_clients.get(key)
+            if client is None:
+                client = _new_redis_client(host, port, cluster, fake, db,
+                                           max_connections)
+                _redis_clients[key] = client
+    return client
 
 
 class SessionStore(object):
@@ -43,25 +313,28 @@ class SessionStore(object):
     Pass fake=True to use FakeRedis for testing of development.
     """
 
+    __slots__ = ('r', '_secret', '_secret_bytes', '_hmac', '_duration')
+
     def __init__(self, host: str, port: int, db: int, secret: str,
                  duration: int = 7200, token: Optional[str] = None,
-                 cluster: bool = True, fake: bool = False) -> None:
-        """Open the connection to Redis."""
+                 cluster: bool = True, fake: bool = False,
+                 client: Optional[Any] = None) -> None:
+        """
+        Open the connection to Redis.
+
+        If ``client`` is passed, it is used instead of opening a new
+        connection (see :func:`get_redis_client`).
+        """
         self._secret = secret
+        # PyJWT would otherwise encode the secret on every call.
+        self._secret_bytes = secret.encode('utf-8')
+        # Keying HMAC means hashing the padded key; we do that once, and copy
+        # the keyed state for each cookie that we sign or verify.
+        self._hmac = hmac.new(self._secret_bytes, digestmod=hashlib.sha256)
         self._duration = duration
-        if fake:
-            logger.warning('Using FakeRedis')
-            import fakeredis # this is a dev dependency needed during testing
-            self.r = fakeredis.FakeStrictRedis()
-        else:
-            logger.debug('New Redis connection at %s, port %s', host, port)
-            if cluster:
-                self.r = rediscluster.StrictRedisCluster(
-                    startup_nodes=[{'host': host, 'port': str(port)}],
-                    skip_full_coverage_check=True
-                )
-            else:
-                self.r = redis.StrictRedis(host=host, port=port)
+        if client is None:
+            client = get_redis_client(host, port, cluster, fake, db)
+        self.r = client
 
     def create(self, authorizations: domain.Authorizations,
                ip_address: str, remote_host: str, tracking_cookie: str = '',
@@ -85,11 +358,65 @@ class SessionStore(object):
         :class:`.Session`
 
         """
+        session = self._new_session(authorizations, user=user, client=client,
+                                    session_id=session_id)
+        logger.debug('storing session %s', session)
+        try:
+            self.r.set(session.session_id, self._encode(session),
+                       ex=self._duration)
+        except redis.exceptions.ConnectionError as e:
+            raise SessionCreationFailed(f'Connection failed: {e}') from e
+        except Exception as e:
+            raise SessionCreationFailed(f'Failed to create: {e}') from e
+
+        return session
+
+    def create_many(self, specs: Iterable[Dict[str, Any]]) \
+            -> List[domain.Session]:
+        """
+        Create several sessions.
+
+        The sessions are sent to Redis in a single pipeline, rather than
+        paying one round trip per session.
+
+        Parameters
+        ----------
+        specs : iterable of dict
+            Each holds the keyword arguments that :meth:`create` would take
+            for one session.
+
+        Returns
+        -------
+        list of :class:`.Session`
+
+        """
+        sessions = [self._new_session(spec['authorizations'],
+                                      user=spec.get('user'),
+                                      client=spec.get('client'),
+                                      session_id=spec.get('session_id'))
+                    for spec in specs]
+        logger.debug('storing %i sessions', len(sessions))
+        try:
+            with self.r.pipeline(transaction=False) as pipe:
+                for session in sessions:
+                    pipe.set(session.session_id, self._encode(session),
+                             ex=self._duration)
+                pipe.execute()
+        except redis.exceptions.ConnectionError as e:
+            raise SessionCreationFailed(f'Connection failed: {e}') from e
+        except Exception as e:
+            raise SessionCreationFailed(f'Failed to create: {e}') from e
+        return sessions
+
+    def _new_session(self, authorizations: domain.Authorizations,
+                     user: Optional[domain.User] = None,
+                     client: Optional[domain.Client] = None,
+                     session_id: Optional[str] = None) -> domain.Session:
         if session_id is None:
-            session_id = str(uuid.uuid4())
-        start_time = datetime.now(tz=UTC)
+            session_id = uuid.uuid4().hex
+        start_time = datetime.fromtimestamp(time.time(), tz=UTC)
         end_time = start_time + timedelta(seconds=self._duration)
-        session = domain.Session(
+        return domain.Session(
             session_id=session_id,
             user=user,
             client=client,
@@ -98,17 +425,6 @@ class SessionStore(object):
             authorizations=authorizations,
             nonce=_generate_nonce()
         )
-        logger.debug('storing session %s', session)
-        try:
-            self.r.set(session_id,
-                       jwt.encode(session.json_safe_dict(), self._secret),
-                       ex=self._duration)
-        except redis.exceptions.ConnectionError as e:
-            raise SessionCreationFailed(f'Connection failed: {e}') from e
-        except Exception as e:
-            raise SessionCreationFailed(f'Failed to create: {e}') from e
-
-        return session
 
     def generate_cookie(self, session: domain.Session) -> str:
         """Generate a cookie from a :class:`domain.Session`."""
@@ -116,12 +432,21 @@ class SessionStore(object):
             raise RuntimeError('Session has no expiry')
         if session.user is None:
             raise RuntimeError('Session user is not set')
-        return self._pack_cookie({
-            'user_id': session.user.user_id,
-            'session_id': session.session_id,
-            'nonce': session.nonce,
-            'expires': session.end_time.isoformat()
-        })
+        # The signature depends only on the secret and the claims, so a
+        # cookie for the same session (with the same expiry) can be reused
+        # rather than built and signed all over again.
+        key = (self._secret, session.user.user_id, session.session_id,
+               session.nonce, session.end_time)
+        cookie = _get_signed_cookie(key)
+        if cookie is None:
+            cookie = self._pack_cookie({
+                'user_id': session.user.user_id,
+                'session_id': session.session_id,
+                'nonce': session.nonce,
+                'expires': session.end_time.isoformat()
+            })
+            _cache_signed_cookie(key, cookie)
+        return cookie
 
     def delete(self, cookie: str) -> None:
         """
@@ -151,6 +476,30 @@ class SessionStore(object):
         except Exception as e:
             raise SessionDeletionFailed(f'Failed to delete: {e}') from e
 
+    def delete_many(self, session_ids: Iterable[str]) -> None:
+        """
+        Delete several sessions in the key-value store by ID.
+
+        The deletions are sent to Redis in a single pipeline, rather than
+        paying one round trip per session. On a cluster the pipeline groups
+        commands by node and writes to every node before reading any replies,
+        so the cost scales with the number of nodes rather than keys.
+
+        Parameters
+        ----------
+        session_ids : iterable of str
+
+        """
+        try:
+            with self.r.pipeline(transaction=False) as pipe:
+                for session_id in session_ids:
+                    pipe.delete(session_id)
+                pipe.execute()
+        except redis.exceptions.ConnectionError as e:
+            raise SessionDeletionFailed(f'Connection failed: {e}') from e
+        except Exception as e:
+            raise SessionDeletionFailed(f'Failed to delete: {e}') from e
+
     def validate_session_against_cookie(self, session: domain.Session,
                                         cookie: str) -> None:
         """
@@ -167,22 +516,34 @@ class SessionStore(object):
             Raised if the data in the cookie does not match the session data.
 
         """
-        cookie_data = self._unpack_cookie(cookie)
-        if cookie_data['nonce'] != session.nonce \
-                or session.user is None \
-                or session.user.user_id != cookie_data['user_id']:
+        self._validate_session_against_cookie_data(
+            session, self._unpack_cookie(cookie))
+
+    def _validate_session_against_cookie_data(self, session: domain.Session,
+                                              cookie_data: dict) -> None:
+        """Validate session data against already-unpacked cookie data."""
+        if session.user is None:
+            raise InvalidToken('Invalid token; likely a forgery')
+        # Compare in constant time, so as not to leak how much of the nonce
+        # a forged cookie got right. ``repr`` keeps e.g. None and 'None'
+        # apart.
+        expected = f'{session.nonce!r}|{session.user.user_id!r}'
+        actual = f"{cookie_data['nonce']!r}|{cookie_data['user_id']!r}"
+        if not hmac.compare_digest(expected.encode('utf-8'),
+                                   actual.encode('utf-8')):
             raise InvalidToken('Invalid token; likely a forgery')
 
-    def load(self, cookie: str, decode: bool = True) \
+    def load(self, cookie: Union[str, bytes], decode: bool = True) \
             -> Union[domain.Session, str, bytes]:
         """Load a session using a session cookie."""
+        cookie_data = self._unpack_cookie(cookie)
         try:
-            cookie_data = self._unpack_cookie(cookie)
-            expires = dateutil.parser.parse(cookie_data['expires'])
-        except (KeyError, jwt.exceptions.DecodeError) as e:
+            expires_at = _expires_at(cookie_data['expires'])
+        except (KeyError, TypeError, ValueError) as e:
             raise InvalidToken('Token payload malformed') from e
 
-        if expires <= datetime.now(tz=UTC):
+        # Comparing timestamps spares us building an aware "now" datetime.
+        if expires_at <= time.time():
             raise InvalidToken('Session has expired')
 
         session = self.load_by_id(cookie_data['session_id'], decode=decode)
@@ -191,46 +552,150 @@ class SessionStore(object):
             assert isinstance(session, str) or isinstance(session, bytes)
             return session
         assert isinstance(session, domain.Session)
+        # The cookie's expiry need not be the session's ``end_time``, so the
+        # session itself must not have ended either.
         if session.expired:
             raise ExpiredToken('Session has expired')
         if session.user is None and session.client is None:
             raise InvalidToken('Neither user nor client data are present')
 
-        self.validate_session_against_cookie(session, cookie)
+        # We already have the cookie data, so there's no need to unpack (and
+        # verify) the cookie a second time.
+        self._validate_session_against_cookie_data(session, cookie_data)
         return session
 
     def load_by_id(self, session_id: str, decode: bool = True) \
             -> Union[domain.Session, str, bytes]:
-        """Get session data by session ID."""
+        """
+        Get session data by session ID.
+
+        The record's TTL is fixed when the session is created, and reading a
+        session never refreshes it. A single ``GET`` is all it takes.
+        """
         session_jwt: str = self.r.get(session_id)
         if not session_jwt:
-            logger.debug(f'No such session: {session_id}')
+            logger.debug('No such session: %s', session_id)
             raise UnknownSession(f'Failed to find session {session_id}')
         if decode:
             return self._decode(session_jwt)
         return session_jwt
 
-    def _encode(self, session_data: dict) -> bytes:
-        return jwt.encode(session_data, self._secret)
+    def load_many_by_id(self, session_ids: Iterable[str],
+                        decode: bool = True) \
+            -> List[Optional[Union[domain.Session, str, bytes]]]:
+        """
+        Get data for several sessions by ID.
+
+        The reads are sent to Redis in a single pipeline. We don't use MGET,
+        since Redis Cluster only allows it for keys in the same slot. The
+        cluster pipeline already buckets keys by node and talks to the nodes
+        concurrently, and it follows MOVED/ASK redirects during resharding.
 
-    def _decode(self, session_jwt: str) -> domain.Session:
-        try:
-            return domain.Session.parse_obj(
-                jwt.decode(session_jwt, self._secret, algorithms=['HS256']))
-        except jwt.exceptions.InvalidSignatureError:
-            raise InvalidToken('Invalid or corrupted session token')
+        Returns
+        -------
+        list
+            The sessions, in the same order as ``session_ids``. Sessions that
+            could not be found are None.
 
-    def _unpack_cookie(self, cookie: str) -> dict:
+        """
+        with self.r.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.get(session_id)
+            session_jwts = pipe.execute()
+        if not decode:
+            return [session_jwt or None for session_jwt in session_jwts]
+        return [self._decode(session_jwt) if session_jwt else None
+                for session_jwt in session_jwts]
+
+    def _encode(self, session: domain.Session) -> str:
+        # The payload is serialized by us rather than by PyJWT, so that we
+        # can use a faster JSON codec. The result is still a regular JWT.
+        return _jws.encode(_dumps_session(session), self._secret_bytes,
+                           algorithm='HS256')
+
+    def _decode(self, session_jwt: Union[str, bytes]) -> domain.Session:
+        if isinstance(session_jwt, str):
+            session_jwt = session_jwt.encode('utf-8')
+        try:
+            payload = self._verify_signature(session_jwt)
+            if payload is None:
+                payload = _jws.decode(session_jwt, self._secret_bytes,
+                                      algorithms=_ALGORITHMS)
+            return _loads_session(payload)
+        # ValueError includes binascii errors and pydantic's ValidationError.
+        except (jwt.exceptions.InvalidTokenError, ValueError) as e:
+            raise InvalidToken('Invalid or corrupted session token') from e
+
+    def _unpack_cookie(self, cookie: Union[str, bytes]) -> dict:
+        # Cookies may arrive as bytes (e.g. from a raw header), which we can
+        # verify as they are rather than decoding them to str first.
+        if isinstance(cookie, str):
+            dot: Union[str, bytes] = '.'
+        elif isinstance(cookie, bytes):
+            dot = b'.'
+        else:
+            raise InvalidToken('Session cookie is malformed')
+        # Turn away anything that is obviously not one of our cookies before
+        # doing any decoding or crypto work on it.
+        if not cookie.isascii() or cookie.count(dot) != 2 \
+                or not _MIN_COOKIE_LENGTH <= len(cookie) <= _MAX_COOKIE_LENGTH:
+            raise InvalidToken('Session cookie is malformed')
         secret = self._secret
+        # Verifying the signature is the most expensive part of loading a
+        # session, and the same cookie comes back on every request. So we
+        # remember cookies that we have already verified until they expire.
+        key = (secret, cookie)
+        cached = _get_cached_cookie(key)
+        if cached is not None:
+            return cached
+        data = self._verify_cookie(cookie)
+        _cache_cookie(key, data)
+        return data
+
+    def _verify_cookie(self, cookie: Union[str, bytes]) -> dict:
+        """Verify the signature of a session cookie, and get its claims."""
+        if isinstance(cookie, str):
+            cookie = cookie.encode('ascii')
         try:
-            data = dict(jwt.decode(cookie, secret, algorithms=['HS256']))
-        except jwt.exceptions.DecodeError as e:
+            payload = self._verify_signature(cookie)
+            if payload is None:
+                data: dict = jwt.decode(cookie, self._secret_bytes,
+                                        algorithms=_ALGORITHMS,
+                                        options=_DECODE_OPTIONS)
+                return data
+            return _loads_claims(payload)
+        # ValueError includes binascii and JSON errors.
+        except (jwt.exceptions.InvalidTokenError, ValueError) as e:
             raise InvalidToken('Session cookie is malformed') from e
-        return data
+
+    def _verify_signature(self, token: bytes) -> Optional[bytes]:
+        """
+        Verify the signature of a JWT that we wrote, and get its raw payload.
+
+        Returns None if the token has a header that we would not write, in
+        which case it is up to PyJWT to sort it out.
+        """
+        # Our session records and cookies always have the same header, so we
+        # can check the HS256 signature ourselves and skip PyJWT's header
+        # handling.
+        signing_input, _, signature = token.rpartition(b'.')
+        if not signing_input.startswith(_HEADER + b'.'):
+            return None
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        if not hmac.compare_digest(_b64url(mac.digest()), signature):
+            raise jwt.exceptions.InvalidSignatureError('Signature mismatch')
+        return _b64url_decode(signing_input[len(_HEADER) + 1:])
 
     def _pack_cookie(self, cookie_data: dict) -> str:
-        secret = self._secret
-        return jwt.encode(cookie_data, secret)
+        # Cookies always have the same header, so we build the (HS256) JWT
+        # ourselves rather than have PyJWT encode the header every time. The
+        # cookie is the same JWT that jwt.encode() would have produced.
+        signing_input = \
+            _HEADER + b'.' + _b64url(_dumps_claims(cookie_data))
+        mac = self._hmac.copy()
+        mac.update(signing_input)
+        return (signing_input + b'.' + _b64url(mac.digest())).decode('ascii')
 
     @classmethod
     def init_app(cls, app: object = None) -> None:
@@ -244,21 +709,34 @@ class SessionStore(object):
         config.setdefault('JWT_SECRET', 'foosecret')
         config.setdefault('SESSION_DURATION', '7200')
         config.setdefault('REDIS_FAKE', False)
+        config.setdefault('REDIS_MAX_CONNECTIONS', None)
 
     @classmethod
     def get_session(cls, app: object = None) -> 'SessionStore':
-        """Get a new session with the search index."""
+        """
+        Get the session store for the current configuration.
+
+        The store holds no per-request state, so one instance (and one Redis
+        client) is shared for each configuration in the process.
+        """
         config = get_application_config(app)
-        host = config.get('REDIS_HOST', 'localhost')
-        port = int(config.get('REDIS_PORT', '7000'))
-        db = int(config.get('REDIS_DATABASE', '0'))
-        token = config.get('REDIS_TOKEN', None)
-        cluster = config.get('REDIS_CLUSTER', '1') == '1'
-        secret = config['JWT_SECRET']
-        duration = int(config.get('SESSION_DURATION', '7200'))
-        fake = config.get('REDIS_FAKE', False)
-        return cls(host, port, db, secret, duration, token=token,
-                   cluster=cluster, fake=fake)
+        # Stores are looked up by the raw config values, so that the common
+        # case costs a handful of ``get`` calls. The values are only parsed
+        # (see :class:`SessionConfig`) when we need a new store. Apps may
+        # still change their config after ``init_app``.
+        key = (cls, *[config.get(k) for k in _CONFIG_KEYS])
+        session_store = _session_stores.get(key)
+        if session_store is None:
+            settings = SessionConfig.from_config(config)
+            client = get_redis_client(settings.host, settings.port,
+                                      settings.cluster, settings.fake,
+                                      settings.db, settings.max_connections)
+            session_store = cls(settings.host, settings.port, settings.db,
+                                settings.secret, settings.duration,
+                                token=settings.token, cluster=settings.cluster,
+                                fake=settings.fake, client=client)
+            _session_stores[key] = session_store
+        return session_store
 
     @classmethod
     def current_session(cls) -> 'SessionStore':
@@ -266,6 +744,9 @@ class SessionStore(object):
         g = get_application_global()
         if not g:
             return cls.get_session()
-        if 'redis' not in g:
-            g.redis = cls.get_session()
-        return g.redis      # type: ignore
+        # A single lookup on the ``g`` proxy, rather than ``in`` and then
+        # the attribute.
+        session_store: Optional['SessionStore'] = g.get('redis')
+        if session_store is None:
+            session_store = g.redis = cls.get_session()
+        return session_store
@@ -4,6 +4,7 @@ from unittest import TestCase, mock
 import jwt
 
 from .... import domain
+from ... import tokens
 from .. import store
 
 
@@ -47,6 +48,8 @@ class TestDistributedSessionServiceIntegration(TestCase):
         stored_data = jwt.decode(raw, self.secret, algorithms=['HS256'])
         cookie_data = jwt.decode(cookie, self.secret, algorithms=['HS256'])
         self.assertEqual(stored_data['nonce'], cookie_data['nonce'])
+        self.assertGreater(r.ttl(session.session_id), 0,
+                           "The record expires along with the session")
 
     # def test_invalidate_session(self):
     #     """Invalidate a session from the datastore."""
@@ -80,3 +83,78 @@ class TestDistributedSessionServiceIntegration(TestCase):
         r.set('fookey', b'foovalue')
         s.delete_by_id('fookey')
         self.assertIsNone(r.get('fookey'))
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    def test_delete_many_sessions(self, mock_get_config):
+        """Delete several sessions from the datastore at once."""
+        mock_get_config.return_value = {
+            'JWT_SECRET': self.secret,
+            'REDIS_FAKE': True
+        }
+        s = store.SessionStore.current_session()
+        r = s.r
+        r.set('fookey', b'foovalue')
+        r.set('barkey', b'barvalue')
+        s.delete_many(['fookey', 'barkey'])
+        self.assertIsNone(r.get('fookey'))
+        self.assertIsNone(r.get('barkey'))
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    def test_create_many_sessions(self, mock_get_config):
+        """Create several sessions in the datastore at once."""
+        mock_get_config.return_value = {
+            'JWT_SECRET': self.secret,
+            'REDIS_FAKE': True
+        }
+        authorizations = domain.Authorizations(scopes=['foo:write'])
+        s = store.SessionStore.current_session()
+        sessions = s.create_many([
+            {'authorizations': authorizations,
+             'user': domain.User(user_id=str(i), username=f'user{i}',
+                                 email=f'user{i}@foo.com')}
+            for i in range(3)
+        ])
+        self.assertEqual(len(sessions), 3)
+        self.assertEqual(len({session.session_id for session in sessions}), 3)
+        for session in sessions:
+            loaded = s.load(s.generate_cookie(session))
+            self.assertEqual(loaded, session)
+            self.assertGreater(s.r.ttl(session.session_id), 0)
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    def test_stored_session_is_auth_token(self, mock_get_config):
+        """The stored record can be passed on as-is as an auth token."""
+        mock_get_config.return_value = {
+            'JWT_SECRET': self.secret,
+            'REDIS_FAKE': True
+        }
+        s = store.SessionStore.current_session()
+        session = s.create(domain.Authorizations(scopes=['foo:write']),
+                           '127.0.0.1', 'foo-host.foo.com',
+                           user=domain.User(user_id='1', username='theuser',
+                                            email='the@user.com'))
+        raw = s.load(s.generate_cookie(session), decode=False)
+        self.assertEqual(tokens.decode(raw, self.secret), session)
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    def test_load_many_sessions(self, mock_get_config):
+        """Load several sessions from the datastore at once."""
+        mock_get_config.return_value = {
+            'JWT_SECRET': self.secret,
+            'REDIS_FAKE': True
+        }
+        s = store.SessionStore.current_session()
+        sessions = s.create_many([
+            {'authorizations': domain.Authorizations(scopes=['foo:write']),
+             'user': domain.User(user_id=str(i), username=f'user{i}',
+                                 email=f'user{i}@foo.com')}
+            for i in range(2)
+        ])
+        session_ids = [sessions[0].session_id, 'nosuchsession',
+                       sessions[1].session_id]
+        loaded = s.load_many_by_id(session_ids)
+        self.assertEqual(loaded, [sessions[0], None, sessions[1]])
+
+        raw = s.load_many_by_id(session_ids, decode=False)
+        self.assertIsNone(raw[1])
+        self.assertEqual(raw[0], s.load_by_id(session_ids[0], decode=False))
@@ -17,6 +17,10 @@ EASTERN = timezone('US/Eastern')
 class TestDistributedSessionService(TestCase):
     """The store session service puts sessions in a key-value store."""
 
+    def setUp(self):
+        """Make sure that each test gets its own (mock) Redis client."""
+        store._redis_clients.clear()
+
     @mock.patch(f'{store.__name__}.get_application_config')
     @mock.patch(f'{store.__name__}.rediscluster')
     def test_create(self, mock_redis, mock_get_config):
@@ -44,6 +48,9 @@ class TestDistributedSessionService(TestCase):
         self.assertTrue(bool(session.session_id))
         self.assertIsNotNone(cookie)
         self.assertEqual(mock_redis_connection.set.call_count, 1)
+        _, kwargs = mock_redis_connection.set.call_args
+        self.assertEqual(kwargs['ex'], 7200,
+                         "The record expires along with the session")
 
     @mock.patch(f'{store.__name__}.get_application_config')
     @mock.patch(f'{store.__name__}.rediscluster')
@@ -57,6 +64,62 @@ class TestDistributedSessionService(TestCase):
         r.delete_by_id('fookey')
         self.assertEqual(mock_redis_connection.delete.call_count, 1)
 
+        end_time = datetime.now(tz=UTC) + timedelta(seconds=60)
+        cookie = r._pack_cookie({
+            'user_id': '1',
+            'session_id': 'fookey',
+            'nonce': '12345678',
+            'expires': end_time.isoformat()
+        })
+        r.delete(cookie)
+        mock_redis_connection.delete.assert_called_with('fookey')
+        self.assertEqual(mock_redis_connection.get.call_count, 0,
+                         "The stored session is not read back to delete it")
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_delete_many(self, mock_redis, mock_get_config):
+        """Delete several sessions from the datastore in one pipeline."""
+        mock_get_config.return_value = {'JWT_SECRET': 'foosecret'}
+        mock_redis.exceptions.ConnectionError = ConnectionError
+        mock_redis_connection = mock.MagicMock()
+        mock_redis.StrictRedisCluster.return_value = mock_redis_connection
+        mock_pipe = \
+            mock_redis_connection.pipeline.return_value.__enter__.return_value
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        r.delete_many(['fookey', 'barkey', 'bazkey'])
+        self.assertEqual(mock_pipe.delete.call_count, 3)
+        self.assertEqual(mock_pipe.execute.call_count, 1)
+        self.assertEqual(mock_redis_connection.delete.call_count, 0)
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_create_many(self, mock_redis, mock_get_config):
+        """Create several sessions in the datastore in one pipeline."""
+        mock_get_config.return_value = {'JWT_SECRET': 'foosecret'}
+        mock_redis.exceptions.ConnectionError = ConnectionError
+        mock_redis_connection = mock.MagicMock()
+        mock_redis.StrictRedisCluster.return_value = mock_redis_connection
+        mock_pipe = \
+            mock_redis_connection.pipeline.return_value.__enter__.return_value
+        auths = domain.Authorizations(scopes=['foo:write'])
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        sessions = r.create_many([
+            {'authorizations': auths,
+             'user': domain.User(user_id='1', username='foo',
+                                 email='foo@user.com')},
+            {'authorizations': auths,
+             'client': domain.Client(owner_id='1', client_id='2')}
+        ])
+        self.assertEqual(len(sessions), 2)
+        self.assertEqual(mock_pipe.set.call_count, 2)
+        self.assertEqual(mock_pipe.execute.call_count, 1)
+        self.assertEqual(mock_redis_connection.set.call_count, 0)
+
+        mock_pipe.execute.side_effect = ConnectionError
+        with self.assertRaises(store.SessionCreationFailed):
+            r.create_many([{'authorizations': auths}])
+
     @mock.patch(f'{store.__name__}.get_application_config')
     @mock.patch(f'{store.__name__}.rediscluster')
     def test_connection_failed(self, mock_redis, mock_get_config):
@@ -82,10 +145,256 @@ class TestDistributedSessionService(TestCase):
         with self.assertRaises(store.SessionCreationFailed):
             r.create(auths, ip, remote_host, user=user)
 
+    def test_generate_nonce(self):
+        """Nonces are zero-padded digits from a secure source."""
+        with mock.patch(f'{store.__name__}.secrets.randbelow',
+                        return_value=42) as mock_randbelow:
+            self.assertEqual(store._generate_nonce(), '00000042')
+        mock_randbelow.assert_called_once_with(10 ** 8)
+        nonce = store._generate_nonce()
+        self.assertEqual(len(nonce), 8)
+        self.assertTrue(nonce.isdigit())
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_unpack_cookie_is_cached(self, mock_redis):
+        """A cookie is only verified once while it is valid."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        end_time = datetime.now(tz=UTC) + timedelta(seconds=7200)
+        cookie = r._pack_cookie({
+            'user_id': '1',
+            'session_id': 'cachedsession',
+            'nonce': '12345678',
+            'expires': end_time.isoformat()
+        })
+        with mock.patch.object(store.SessionStore, '_verify_cookie',
+                               autospec=True,
+                               side_effect=store.SessionStore._verify_cookie) \
+                as mock_verify:
+            first = r._unpack_cookie(cookie)
+            second = r._unpack_cookie(cookie)
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second, "Callers get their own copy")
+        self.assertEqual(mock_verify.call_count, 1)
+
+        other = store.SessionStore('localhost', 7000, 0, 'othersecret')
+        with self.assertRaises(store.InvalidToken):
+            other._unpack_cookie(cookie)
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_pack_cookie(self, mock_redis):
+        """Cookies are regular JWTs."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        cookie_data = {
+            'user_id': '1',
+            'session_id': 'packedsession',
+            'nonce': '12345678',
+            'expires': datetime.now(tz=UTC).isoformat()
+        }
+        self.assertEqual(r._pack_cookie(cookie_data),
+                         jwt.encode(cookie_data, 'foosecret',
+                                    algorithm='HS256'))
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_unpack_implausible_cookie(self, mock_redis):
+        """Obviously malformed cookies are rejected without decoding them."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        with mock.patch.object(store.SessionStore,
+                               '_verify_cookie') as mock_verify:
+            for cookie in ['', 'notatoken', 'a.b', 'a' * 30,
+                           'a.b.c.d' * 5, 'é' * 10 + '.ab.cd',
+                           'a' * 8192 + '.b.c', b'a.b', None]:
+                with self.assertRaises(store.InvalidToken):
+                    r._unpack_cookie(cookie)
+        self.assertEqual(mock_verify.call_count, 0)
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_verify_cookie(self, mock_redis):
+        """Only cookies signed with our secret are accepted."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        claims = {
+            'user_id': '1',
+            'session_id': 'verifiedsession',
+            'nonce': '12345678',
+            'expires': datetime.now(tz=UTC).isoformat()
+        }
+        cookie = r._pack_cookie(claims)
+        self.assertEqual(r._verify_cookie(cookie), claims)
+        self.assertEqual(r._verify_cookie(cookie.encode('ascii')), claims)
+        self.assertEqual(r._unpack_cookie(cookie.encode('ascii')), claims)
+
+        # Signed by PyJWT, but with a header that we would not write.
+        other_header = jwt.encode(claims, 'foosecret', algorithm='HS256',
+                                  headers={'kid': 'foo'})
+        self.assertEqual(r._verify_cookie(other_header), claims)
+        self.assertEqual(r._verify_cookie(other_header.encode('ascii')),
+                         claims)
+
+        header, payload, signature = cookie.split('.')
+        forged_payload = store._b64url(
+            json.dumps(dict(claims, user_id='2')).encode()
+        ).decode()
+        for bad in [f'{header}.{payload}.{signature[:-2]}',
+                    f'{header}.{forged_payload}.{signature}',
+                    jwt.encode(claims, 'notthesecret', algorithm='HS256'),
+                    jwt.encode(claims, None, algorithm='none')]:
+            with self.assertRaises(store.InvalidToken):
+                r._verify_cookie(bad)
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_generate_cookie_is_cached(self, mock_redis):
+        """A cookie is only signed once for the same session and expiry."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        session = domain.Session(
+            session_id='cookiesession',
+            start_time=datetime.now(tz=UTC),
+            end_time=datetime.now(tz=UTC) + timedelta(seconds=7200),
+            user=domain.User(user_id='1', username='theuser',
+                             email='the@user.com'),
+            nonce='12345678'
+        )
+        with mock.patch.object(store.SessionStore, '_pack_cookie',
+                               autospec=True,
+                               side_effect=store.SessionStore._pack_cookie) \
+                as mock_pack:
+            first = r.generate_cookie(session)
+            second = r.generate_cookie(session)
+            self.assertEqual(first, second)
+            self.assertEqual(mock_pack.call_count, 1)
+
+            session.end_time += timedelta(seconds=60)
+            refreshed = r.generate_cookie(session)
+            self.assertNotEqual(refreshed, first)
+            self.assertEqual(mock_pack.call_count, 2)
+        self.assertEqual(r._unpack_cookie(refreshed)['expires'],
+                         session.end_time.isoformat())
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_encode_decode(self, mock_redis):
+        """A session survives a round trip through the store's encoding."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        session = domain.Session(
+            session_id='roundtrip',
+            start_time=datetime.now(tz=UTC),
+            end_time=datetime.now(tz=UTC) + timedelta(seconds=7200),
+            user=domain.User(user_id='1', username='theuser',
+                             email='the@user.com'),
+            authorizations=domain.Authorizations(scopes=['foo:write'])
+        )
+        self.assertEqual(r._decode(r._encode(session)), session)
+
+        corrupted = jwt.api_jws.encode(b'{"session_id": 1}', 'foosecret',
+                                       algorithm='HS256')
+        with self.assertRaises(store.InvalidToken):
+            r._decode(corrupted)
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_decode_verifies_signature(self, mock_redis):
+        """A session record is only decoded if its signature checks out."""
+        r = store.SessionStore('localhost', 7000, 0, 'foosecret')
+        session = domain.Session(
+            session_id='signedrecord',
+            start_time=datetime.now(tz=UTC),
+            end_time=datetime.now(tz=UTC) + timedelta(seconds=7200),
+            user=domain.User(user_id='1', username='theuser',
+                             email='the@user.com')
+        )
+        session_jwt = r._encode(session)
+        self.assertEqual(r._decode(session_jwt.encode('ascii')), session)
+
+        other = store.SessionStore('localhost', 7000, 0, 'othersecret')
+        with self.assertRaises(store.InvalidToken):
+            other._decode(session_jwt)
+        signing_input, _, signature = session_jwt.rpartition('.')
+        other_char = 'B' if signature[0] == 'A' else 'A'
+        with self.assertRaises(store.InvalidToken):
+            r._decode(f'{signing_input}.{other_char}{signature[1:]}')
+
+        # Records with some other header are left to PyJWT.
+        with_kid = jwt.api_jws.encode(store._dumps_session(session),
+                                      'foosecret', algorithm='HS256',
+                                      headers={'kid': 'foo'})
+        self.assertEqual(r._decode(with_kid), session)
+
+    @mock.patch(f'{store.__name__}.rediscluster')
+    def test_redis_client_is_shared(self, mock_redis):
+        """Only one Redis client is created for a given configuration."""
+        store._redis_clients.clear()
+        first = store.get_redis_client('localhost', 7000)
+        second = store.get_redis_client('localhost', 7000)
+        self.assertIs(first, second)
+        self.assertEqual(mock_redis.StrictRedisCluster.call_count, 1)
+        store._redis_clients.clear()
+
 
 class TestGetSession(TestCase):
     """Tests for :func:`store.SessionStore.current_session().load`."""
 
+    def setUp(self):
+        """Make sure that each test gets its own (mock) Redis client."""
+        store._redis_clients.clear()
+        store._session_stores.clear()
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    @mock.patch(f'{store.__name__}.redis.StrictRedis')
+    @mock.patch(f'{store.__name__}.rediscluster.StrictRedisCluster')
+    def test_cluster_config(self, mock_cluster, mock_redis, mock_get_config):
+        """``REDIS_CLUSTER`` picks a cluster or a single-node client."""
+        for value, cluster in [('1', True), (True, True), ('true', True),
+                               ('0', False), (False, False)]:
+            store._redis_clients.clear()
+            mock_get_config.return_value = {
+                'JWT_SECRET': 'barsecret',
+                'REDIS_HOST': 'redis',
+                'REDIS_PORT': '1234',
+                'REDIS_DATABASE': 4,
+                'REDIS_CLUSTER': value
+            }
+            r = store.SessionStore.get_session()
+            if cluster:
+                self.assertIs(r.r, mock_cluster.return_value)
+            else:
+                self.assertIs(r.r, mock_redis.return_value)
+                mock_redis.assert_called_with(host='redis', port=1234, db=4,
+                                              max_connections=None)
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    @mock.patch(f'{store.__name__}.rediscluster.StrictRedisCluster')
+    def test_store_is_shared(self, mock_cluster, mock_get_config):
+        """One store and client are used for a given configuration."""
+        mock_get_config.return_value = {
+            'JWT_SECRET': 'barsecret',
+            'REDIS_HOST': 'redis',
+            'REDIS_PORT': '1234',
+            'REDIS_MAX_CONNECTIONS': '64'
+        }
+        first = store.SessionStore.get_session()
+        second = store.SessionStore.get_session()
+        self.assertIs(first, second)
+        self.assertEqual(mock_cluster.call_count, 1)
+        _, kwargs = mock_cluster.call_args
+        self.assertEqual(kwargs['max_connections'], 64)
+
+        mock_get_config.return_value = {'JWT_SECRET': 'othersecret',
+                                        'REDIS_HOST': 'redis',
+                                        'REDIS_PORT': '1234',
+                                        'REDIS_MAX_CONNECTIONS': '64'}
+        other = store.SessionStore.get_session()
+        self.assertIsNot(other, first)
+        self.assertIs(other.r, first.r)
+
+    @mock.patch(f'{store.__name__}.redis.StrictRedis')
+    def test_client_is_shared(self, mock_redis):
+        """Stores created directly share a client for the same server."""
+        first = store.SessionStore('localhost', 6379, 0, 'foosecret',
+                                   cluster=False)
+        second = store.SessionStore('localhost', 6379, 0, 'barsecret',
+                                    cluster=False)
+        self.assertIs(first.r, second.r)
+        self.assertEqual(mock_redis.call_count, 1)
+
+        store.SessionStore('localhost', 6379, 1, 'foosecret', cluster=False)
+        self.assertEqual(mock_redis.call_count, 2)
+
     @mock.patch(f'{store.__name__}.get_application_config')
     @mock.patch(f'{store.__name__}.rediscluster.StrictRedisCluster')
     def test_not_a_token(self, mock_get_redis, mock_get_config):
@@ -177,6 +486,85 @@ class TestGetSession(TestCase):
         with self.assertRaises(store.InvalidToken):
             store.SessionStore.current_session().load(expired_token)
 
+    @mock.patch(f'{store.__name__}.get_application_config')
+    @mock.patch(f'{store.__name__}.rediscluster.StrictRedisCluster')
+    def test_expired_session(self, mock_get_redis, mock_get_config):
+        """The session has ended, although the cookie has not expired."""
+        secret = 'barsecret'
+        mock_get_config.return_value = {
+            'JWT_SECRET': secret,
+            'REDIS_HOST': 'redis',
+            'REDIS_PORT': '1234',
+            'REDIS_DATABASE': 4
+        }
+        mock_redis = mock.MagicMock()
+        now = datetime.now(tz=UTC)
+        mock_redis.get.return_value = jwt.encode({
+            'session_id': 'ajx9043jjx00s',
+            'start_time': (now - timedelta(seconds=7200)).isoformat(),
+            'end_time': (now - timedelta(seconds=60)).isoformat(),
+            'nonce': '0039299290098',
+            'user': {
+                'user_id': '1234',
+                'username': 'foouser',
+                'email': 'foo@foo.com'
+            }
+        }, secret)
+        mock_get_redis.return_value = mock_redis
+
+        claims = {
+            'user_id': '1234',
+            'session_id': 'ajx9043jjx00s',
+            'nonce': '0039299290098',
+            'expires': (now + timedelta(seconds=7200)).isoformat(),
+        }
+        valid_token = jwt.encode(claims, secret)
+        with self.assertRaises(store.ExpiredToken):
+            store.SessionStore.current_session().load(valid_token)
+
+    def test_parse_expires(self):
+        """The ``expires`` claim may be an ISO-8601 string or a timestamp."""
+        expires = datetime(2030, 1, 2, 3, 4, 5, tzinfo=UTC)
+        self.assertEqual(store._parse_expires(expires.isoformat()), expires)
+        self.assertEqual(store._expires_at(expires.timestamp()),
+                         expires.timestamp())
+        self.assertEqual(store._expires_at(int(expires.timestamp())),
+                         expires.timestamp())
+        for bad in [float('inf'), float('nan')]:
+            with self.assertRaises(ValueError):
+                store._expires_at(bad)
+
+        store._expires_at.cache_clear()
+        with mock.patch.object(store, '_parse_expires',
+                               wraps=store._parse_expires) as mock_parse:
+            for _ in range(2):
+                self.assertEqual(store._expires_at(expires.isoformat()),
+                                 expires.timestamp())
+        self.assertEqual(mock_parse.call_count, 1)
+
+    @mock.patch(f'{store.__name__}.get_application_config')
+    @mock.patch(f'{store.__name__}.rediscluster.StrictRedisCluster')
+    def test_malformed_expires(self, mock_get_redis, mock_get_config):
+        """A cookie with a malformed ``expires`` claim is rejected."""
+        secret = 'barsecret'
+        mock_get_config.return_value = {
+            'JWT_SECRET': secret,
+            'REDIS_HOST': 'redis',
+            'REDIS_PORT': '1234',
+            'REDIS_DATABASE': 4
+        }
+        for expires in ['notadate', None, [1], float('nan'),
+                        '99999999999999999999']:
+            claims = {
+                'user_id': '1234',
+                'session_id': 'ajx9043jjx00s',
+                'nonce': '0039299290099',
+                'expires': expires,
+            }
+            token = jwt.encode(claims, secret)
+            with self.assertRaises(store.InvalidToken):
+                store.SessionStore.current_session().load(token)
+
     @mock.patch(f'{store.__name__}.get_application_config')
     @mock.patch(f'{store.__name__}.rediscluster.StrictRedisCluster')
     def test_forged_token(self, mock_get_redis, mock_get_config):
@@ -315,5 +703,11 @@ class TestGetSession(TestCase):
         }
         valid_token = jwt.encode(claims, secret)
 
-        session = store.SessionStore.current_session().load(valid_token)
+        with mock.patch.object(store.SessionStore, '_unpack_cookie',
+                               autospec=True,
+                               side_effect=store.SessionStore._unpack_cookie) \
+                as mock_unpack:
+            session = store.SessionStore.current_session().load(valid_token)
         self.assertIsInstance(session, domain.Session, "Returns a session")
+        self.assertEqual(mock_unpack.call_count, 1,
+                         "The cookie is only unpacked once per load")
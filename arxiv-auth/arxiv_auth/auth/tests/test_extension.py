@@ -60,6 +60,66 @@ def test_legacy_is_valid(mocker, app_with_cookie):
         inst.load_session()
         assert mock_request.auth == session, "Session is attached to the request at auth"
 
+def test_legacy_session_is_not_cached_by_default(mocker, app_with_cookie):
+    """Without ``AUTH_LEGACY_CACHE_TTL``, every request hits the database."""
+    inst = app_with_cookie.config['arxiv_auth.Auth']
+    with app_with_cookie.test_request_context():
+        mock_legacy = mocker.patch(f'{auth.__name__}.legacy')
+        mock_request = mocker.patch(f'{auth.__name__}.request')
+        mock_request.environ = {'auth': None,
+                                'HTTP_COOKIE': 'foo_cookie=sessioncookie123'}
+
+        mock_request.auth = None
+        mock_legacy.is_configured.return_value = True
+        mock_legacy.sessions.load.return_value = domain.Session(
+            session_id='fooid',
+            start_time=datetime.now(tz=UTC),
+            user=domain.User(
+                user_id='235678',
+                email='foo@foo.com',
+                username='foouser'
+            )
+        )
+
+        mock_blake2b = mocker.patch(f'{auth.__name__}.blake2b')
+
+        inst.load_session()
+        inst.load_session()
+        assert mock_legacy.sessions.load.call_count == 2, "Session is loaded from the database each time"
+        assert mock_blake2b.call_count == 0, "Cookies are not hashed for the cache"
+
+def test_legacy_session_is_cached(mocker, app_with_cookie):
+    """With the cache on, a legacy session is only loaded once."""
+    app_with_cookie.config['AUTH_LEGACY_CACHE_TTL'] = 30
+    inst = auth.Auth(app_with_cookie)
+    with app_with_cookie.test_request_context():
+        mock_legacy = mocker.patch(f'{auth.__name__}.legacy')
+        mock_request = mocker.patch(f'{auth.__name__}.request')
+        mock_request.environ = {'auth': None,
+                                'HTTP_COOKIE': 'foo_cookie=sessioncookie123'}
+
+        mock_request.auth = None
+        mock_legacy.is_configured.return_value = True
+        session = domain.Session(
+            session_id='fooid',
+            start_time=datetime.now(tz=UTC),
+            user=domain.User(
+                user_id='235678',
+                email='foo@foo.com',
+                username='foouser'
+            ),
+            authorizations=domain.Authorizations(
+                scopes=[auth.scopes.VIEW_SUBMISSION]
+            )
+        )
+        mock_legacy.sessions.load.return_value = session
+
+        inst.load_session()
+        inst.load_session()
+        assert mock_request.auth == session, "Session is attached to the request at auth"
+        assert mock_request.auth is not session, "Cached session is a copy"
+        assert mock_legacy.sessions.load.call_count == 1, "Session is loaded from the database once"
+
 def test_auth_session_rename(mocker, app_with_cookie):
     """
     The auth session is accessed via ``request.auth``.
@@ -100,7 +160,8 @@ def test_middleware_exception(mocker, app_with_cookie):
     inst = app_with_cookie.config['arxiv_auth.Auth']
     with app_with_cookie.test_request_context():
         mock_request  = mocker.patch(f'{auth.__name__}.request')
-        mock_request.environ = {'auth': RuntimeError('Nope!')}
+        mock_request.environ = {'auth': None,
+                                'auth_error': RuntimeError('Nope!')}
 
 
         with pytest.raises(RuntimeError):
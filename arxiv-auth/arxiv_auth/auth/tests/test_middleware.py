@@ -5,6 +5,7 @@ from unittest import TestCase, mock
 from datetime import datetime
 from pytz import timezone, UTC
 import json
+import jwt
 
 from flask import Flask, Blueprint
 from flask import request, current_app
@@ -25,10 +26,11 @@ blueprint = Blueprint('fooprint', __name__, url_prefix='')
 @blueprint.route('/public', methods=['GET'])
 def public():     # type: ignore
     """Return the request auth as a JSON document, or raise exceptions."""
+    error = request.environ.get('auth_error')
+    if error is not None:
+        raise error
     data = request.environ.get('auth')
     if data:
-        if isinstance(data, Exception):
-            raise data
         return domain.Session.parse_obj(data).json_safe_dict()
     return json.dumps({})
 
@@ -65,7 +67,7 @@ class TestAuthMiddleware(TestCase):
             # client: Optional[Client] = None
             # end_time: Optional[datetime] = None
             authorizations=domain.Authorizations(
-                scopes=scopes.GENERAL_USER
+                scopes=list(scopes.GENERAL_USER_ORDERED)
             ),
             ip_address='10.10.10.10',
             remote_host='foo-host.something.com',
@@ -91,7 +93,7 @@ class TestAuthMiddleware(TestCase):
             # client: Optional[Client] = None
             # end_time: Optional[datetime] = None
             authorizations=domain.Authorizations(
-                scopes=scopes.GENERAL_USER
+                scopes=list(scopes.GENERAL_USER_ORDERED)
             ),
             ip_address='10.10.10.10',
             remote_host='foo-host.something.com',
@@ -101,3 +103,17 @@ class TestAuthMiddleware(TestCase):
         response = self.client.get('/public', headers={'Authorization': token})
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED,
                          "A 401 exception is passed by the middleware")
+
+    def test_unsigned_token(self):
+        """A token using the ``none`` algorithm is passed in the request."""
+        token = jwt.encode({'session_id': 'foo1234'}, None, algorithm='none')
+        response = self.client.get('/public', headers={'Authorization': token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED,
+                         "A 401 exception is passed by the middleware")
+
+    def test_malformed_token(self):
+        """A token with an unreadable header is passed in the request."""
+        response = self.client.get('/public',
+                                   headers={'Authorization': '!!.foo.bar'})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED,
+                         "A 401 exception is passed by the middleware")
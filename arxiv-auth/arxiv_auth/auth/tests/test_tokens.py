@@ -1,8 +1,10 @@
 """Tests for :mod:`arxiv.users.auth.tokens`."""
 
-from unittest import TestCase
+from unittest import TestCase, mock
 from datetime import datetime
 
+import jwt
+
 from .. import tokens
 from ... import domain
 from ...auth import scopes
@@ -40,6 +42,19 @@ class TestEncodeDecode(TestCase):
         data = tokens.decode(token, secret)
         self.assertEqual(session, data)
 
+        # Whichever JSON codec we use, the claims are the same as if PyJWT
+        # had serialized the session itself.
+        self.assertEqual(jwt.decode(token, secret, algorithms=['HS256']),
+                         session.json_safe_dict())
+        _, payload, _ = token.split('.')
+        self.assertEqual(jwt.get_unverified_header(token),
+                         {'alg': 'HS256', 'typ': 'JWT'})
+        self.assertEqual(
+            token,
+            jwt.api_jws.encode(jwt.utils.base64url_decode(payload), secret,
+                               algorithm='HS256')
+        )
+
     def test_mismatched_secrets(self):
         """Secret used to encode is not the same as the one used to decode."""
         session = domain.Session(
@@ -68,3 +83,55 @@ class TestEncodeDecode(TestCase):
 
         with self.assertRaises(tokens.exceptions.InvalidToken):
             tokens.decode(token, 'not the secret')
+
+    def test_decode_invalid_payload(self):
+        """A signed token that does not contain a session is rejected."""
+        secret = 'foosecret'
+        for payload in [b'not json', b'{"session_id": "foo"}']:
+            token = jwt.api_jws.encode(payload, secret, algorithm='HS256')
+            with self.assertRaises(tokens.exceptions.InvalidToken):
+                tokens.decode(token, secret)
+
+    def test_decode_tampered_token(self):
+        """A token whose signature does not match is rejected."""
+        session = domain.Session(
+            session_id='asdf1234',
+            start_time=datetime.now(), end_time=datetime.now(),
+            user=domain.User(user_id='12345', email='foo@bar.com',
+                             username='emanresu')
+        )
+        secret = 'foosecret'
+        token = tokens.encode(session, secret)
+        self.assertEqual(tokens.decode(token, secret), session)
+        signing_input, _, signature = token.rpartition('.')
+        other = 'B' if signature[0] == 'A' else 'A'
+        with self.assertRaises(tokens.exceptions.InvalidToken):
+            tokens.decode(f'{signing_input}.{other}{signature[1:]}', secret)
+
+    def test_decode_implausible_token(self):
+        """Obviously malformed tokens are rejected without verifying them."""
+        with mock.patch.object(tokens._jws, 'decode') as mock_decode:
+            for token in ['', 'notatoken', 'a.b', 'a.b.c', 'a' * 30,
+                          'a.b.c.d' * 5, b'a.b', None]:
+                with self.assertRaises(tokens.exceptions.InvalidToken):
+                    tokens.decode(token, 'foosecret')
+        self.assertEqual(mock_decode.call_count, 0)
+
+    def test_decode_other_header(self):
+        """Tokens with a header that we would not write are still checked."""
+        session = domain.Session(session_id='asdf1234',
+                                 start_time=datetime.now())
+        payload = session.model_dump_json().encode()
+        token = jwt.api_jws.encode(payload, 'foosecret', algorithm='HS256',
+                                   headers={'kid': 'foo'})
+        self.assertEqual(tokens.decode(token, 'foosecret'), session)
+
+        header, payload, signature = tokens.encode(session, 'foosecret') \
+            .split('.')
+        for bad in [jwt.api_jws.encode(payload.encode(), None,
+                                       algorithm='none'),
+                    f'{header}.{payload}.{signature[:-2]}',
+                    f'{header}.{payload}!.{signature}',
+                    jwt.api_jws.encode(b'{}', 'foosecret', algorithm='HS512')]:
+            with self.assertRaises(tokens.exceptions.InvalidToken):
+                tokens.decode(bad, 'foosecret')
@@ -13,10 +13,34 @@ way in all arXiv services, so we include these routines here for convenience.
 
 """
 
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from functools import lru_cache
+from typing import Union
+import hashlib
+import hmac
+
 import jwt
+
+try:
+    import orjson
+except ImportError:     # pragma: no cover
+    orjson = None
+
 from . import exceptions
 from .. import domain
 
+_ALGORITHMS = ['HS256']
+
+_MIN_TOKEN_LENGTH = 20
+"""No JWT that we would produce is shorter than this."""
+
+_HEADER = urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+"""The encoded JOSE header of the tokens that we produce."""
+
+# Built once, rather than having PyJWT look up the algorithm on every call.
+_jwt = jwt.PyJWT()
+_jws = jwt.PyJWS(algorithms=_ALGORITHMS)
+
 
 def encode(session: domain.Session, secret: str) -> str:
     """
@@ -37,13 +61,68 @@ def encode(session: domain.Session, secret: str) -> str:
         An encrypted JWT.
 
     """
-    return jwt.encode(session.json_safe_dict(), secret)
+    if orjson is not None and isinstance(secret, str):
+        # orjson serializes datetimes natively, as ISO-8601, so we can skip
+        # building the JSON-safe copy of the session.
+        return _sign(orjson.dumps(session.model_dump()), secret)
+    return _jwt.encode(session.json_safe_dict(), secret, algorithm='HS256')
 
 
 def decode(token: str, secret: str) -> domain.Session:
     """Decode an auth token to access session information."""
+    # Turn away anything that is obviously not a JWT before doing any
+    # decoding or crypto work on it.
+    if isinstance(token, str):
+        dot: Union[str, bytes] = '.'
+    elif isinstance(token, bytes):
+        dot = b'.'
+    else:
+        raise exceptions.InvalidToken('Not a valid token')
+    if token.count(dot) != 2 or len(token) < _MIN_TOKEN_LENGTH:
+        raise exceptions.InvalidToken('Not a valid token')
     try:
-        data = dict(jwt.decode(token, secret, algorithms=['HS256']))
-    except jwt.exceptions.DecodeError as e:
+        payload = _verify(token, secret)
+    except (jwt.exceptions.InvalidTokenError, ValueError) as e:
+        # ValueError covers malformed base64 in our own tokens.
         raise exceptions.InvalidToken('Not a valid token') from e
-    return domain.session_from_dict(data)
+    # This runs on every request that carries a token, so we let pydantic
+    # parse the JSON payload and build the session in a single pass.
+    try:
+        return domain.Session.model_validate_json(payload)
+    except ValueError as e:     # Includes pydantic's ValidationError.
+        raise exceptions.InvalidToken('Not a valid token') from e
+
+
+@lru_cache(maxsize=16)
+def _hmac_for(secret: str) -> 'hmac.HMAC':
+    """Get an HMAC-SHA256 state that has already been keyed with ``secret``."""
+    return hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+
+
+def _sign(payload: bytes, secret: str) -> str:
+    """Build an HS256 JWT for ``payload``, just as PyJWS would."""
+    signing_input = _HEADER + b'.' + urlsafe_b64encode(payload).rstrip(b'=')
+    mac = _hmac_for(secret).copy()
+    mac.update(signing_input)
+    signature = urlsafe_b64encode(mac.digest()).rstrip(b'=')
+    return (signing_input + b'.' + signature).decode('ascii')
+
+
+def _verify(token: Union[str, bytes], secret: str) -> bytes:
+    """Verify the signature of a token, and get its (raw) payload."""
+    if isinstance(token, str):
+        token = token.encode('ascii')
+    signing_input, _, signature = token.rpartition(b'.')
+    header, _, payload = signing_input.partition(b'.')
+    if header != _HEADER or not isinstance(secret, str):
+        # Not a header that we would write, so let PyJWT sort it out.
+        raw: bytes = _jws.decode(token, secret, algorithms=_ALGORITHMS)
+        return raw
+    # Our own tokens always have the same header, so we can check the
+    # HS256 signature ourselves and skip PyJWT's header handling.
+    mac = _hmac_for(secret).copy()
+    mac.update(signing_input)
+    expected = urlsafe_b64encode(mac.digest()).rstrip(b'=')
+    if not hmac.compare_digest(expected, signature):
+        raise jwt.exceptions.InvalidSignatureError('Signature mismatch')
+    return urlsafe_b64decode(payload + b'=' * (-len(payload) % 4))
@@ -1,11 +1,13 @@
 """Defines user concepts for use in arXiv services."""
 
 
-from typing import Any, Optional, List, NamedTuple
+from typing import Any, Optional, List
 from collections.abc import Iterable
+from functools import lru_cache
 
+import time
 from datetime import datetime
-from pytz import timezone, UTC
+from pytz import timezone
 
 from pydantic import BaseModel, ConfigDict, ValidationError, BeforeValidator, field_validator
 from arxiv import taxonomy
@@ -19,6 +21,7 @@ POST_DOC = ('3', 'Post doc')
 GRAD_STUDENT = ('4', 'Grad student')
 OTHER = ('5', 'Other')
 RANKS = [STAFF, PROFESSOR, POST_DOC, GRAD_STUDENT, OTHER]
+_RANK_NAMES = dict(RANKS)
 
 
 def _check_category(data: Any) -> Category:
@@ -26,7 +29,15 @@ def _check_category(data: Any) -> Category:
         return data
     if not isinstance(data, str):
         raise ValidationError(f"object of type {type(data)} cannnot be used as a Category")
-    cat = Category(data)
+    return _category(data)
+
+
+@lru_cache(maxsize=1024)
+def _category(name: str) -> Category:
+    # Every session carries its endorsements, so the same few categories are
+    # looked up over and over. Categories are immutable strings, so we can
+    # share one instance for each name.
+    cat = Category(name)
     cat.name # possible rasie value error on non-existance
     return cat
 
@@ -74,7 +85,7 @@ class UserProfile(BaseModel):
     @property
     def rank_display(self) -> str:
         """The display name of the user's rank."""
-        _rank: str = dict(RANKS)[str(self.rank)]
+        _rank: str = _RANK_NAMES[str(self.rank)]
         return _rank
 
     @property
@@ -86,20 +97,23 @@ class UserProfile(BaseModel):
     @property
     def default_subject(self) -> Optional[str]:
         """The subject of the default category."""
-        subject: str
-        if '.' in self.default_category:
-            subject = self.default_category.split('.', 1)[1]
-        else:
-            subject = self.default_category
-        return subject
+        # One pass over the string, rather than a search and then a split.
+        _, dot, subject = self.default_category.partition('.')
+        return subject if dot else self.default_category
 
     @property
     def groups_display(self) -> str:
         """Display-ready representation of active groups for this profile."""
-        return ", ".join([
-            taxonomy.definitions.GROUPS[group]['name']
-            for group in self.submission_groups
-        ])
+        return _groups_display(tuple(self.submission_groups))
+
+
+@lru_cache(maxsize=256)
+def _groups_display(groups: tuple) -> str:
+    # Profiles pick from a handful of groups, so the same few combinations
+    # come up again and again when profiles are rendered.
+    return ", ".join([
+        taxonomy.definitions.GROUPS[group]['name'] for group in groups
+    ])
 
 
 class Scope(str):
@@ -131,13 +145,15 @@ class Scope(str):
     @property
     def parts(self) -> str:
         """Get parts of the Scope."""
-        parts = self.split(':')
+        # The resource is everything after the action, colons and all.
+        parts = self.split(':', 2)
         parts = parts + [None] * (3 - len(parts))
         return parts
 
     def for_resource(self, resource_id: str) -> 'Scope':
         """Create a copy of this scope with a specific resource."""
-        return Scope(domain=self.domain, action=self.action, resource=resource_id)
+        domain, action = self.parts[:2]
+        return Scope(domain=domain, action=action, resource=resource_id)
 
     def as_global(self) -> 'Scope':
         """Create a copy of this scope with a global resource."""
@@ -146,12 +162,14 @@ class Scope(str):
     @classmethod
     def from_parts(cls, domain, action=None, resource=None):
         """Create a scope string from parts."""
+        if domain is not None and action is not None and resource is not None:
+            return f"{domain}:{action}:{resource}"
         return ":".join([o for o in [domain,action,resource] if o is not None])
 
     @classmethod
     def to_parts(cls, scopestr):
         """Split a scop string to parts."""
-        parts = scopestr.split(':')
+        parts = scopestr.split(':', 2)
         return parts + [None] * (3 - len(parts))
 
     @classmethod
@@ -220,13 +238,13 @@ class Authorizations(BaseModel):
         if 'scopes' in data:
             if type(data['scopes']) is str:
                 data['scopes'] = [
-                    Scope(*scope.split(':')) for scope
+                    Scope(*scope.split(':', 2)) for scope
                     in data['scopes'].split()
                 ]
             elif type(data['scopes']) is list:
                 data['scopes'] = [
                     Scope(**scope) if type(scope) is dict
-                    else Scope(*scope.split(':'))
+                    else Scope(*scope.split(':', 2))
                     for scope in data['scopes']
                 ]
 
@@ -350,8 +368,9 @@ class Session(BaseModel):
     @property
     def expired(self) -> bool:
         """Expired if the current time is later than :attr:`.end_time`."""
+        # Comparing epoch seconds avoids building an aware datetime for now.
         return bool(self.end_time is not None
-                    and datetime.now(tz=UTC) >= self.end_time)
+                    and self.end_time.timestamp() <= time.time())
 
     @property
     def expires(self) -> Optional[int]:
@@ -362,12 +381,12 @@ class Session(BaseModel):
         """
         if self.end_time is None:
             return None
-        duration = (self.end_time - datetime.now(tz=UTC)).total_seconds()
+        duration = self.end_time.timestamp() - time.time()
         return int(max(duration, 0))
 
     def json_safe_dict(self) -> dict:
         """Creates a json dict with the datetimes converted to ISO datetime strs."""
-        out = self.dict()
+        out = self.model_dump()
         if self.start_time:
             out['start_time'] = self.start_time.isoformat()
         if self.end_time:
@@ -376,4 +395,4 @@ class Session(BaseModel):
 
 def session_from_dict(data: dict) -> Session:
     """Create a Session from a dict."""
-    return Session.parse_obj(data)
+    return Session.model_validate(data)
@@ -29,7 +29,7 @@ def generate_token(user_id: str, email: str, username: str,
 
     # Create a user with endorsements in astro-ph.CO and .GA.
     session = domain.Session(
-        session_id=str(uuid.uuid4()),
+        session_id=uuid.uuid4().hex,
         start_time=start, end_time=end,
         user=domain.User(
             user_id=user_id,
@@ -27,6 +27,9 @@ from werkzeug.datastructures import MultiDict
 from .exceptions import InvalidCookie
 from . import util
 
+_PARSED_COOKIES_KEY = 'arxiv_auth.legacy.cookies'
+"""Key on the WSGI environ where the parsed request cookies are kept."""
+
 
 def unpack(cookie: str) -> Tuple[str, str, str, datetime, datetime, str]:
     """
@@ -130,8 +133,17 @@ def get_cookies(request, cookie_name:str) -> List[str]:
     # single value per key. This isn't really up to speed with RFC 6265.
     # Luckily we can just pass in an alternate struct to parse_cookie()
     # that can cope with multiple values.
-    raw_cookie = request.environ.get('HTTP_COOKIE', None)
+    environ = request.environ
+    raw_cookie = environ.get('HTTP_COOKIE', None)
     if raw_cookie is None:
         return []
-    cookies = parse_cookie(raw_cookie, cls=MultiDict)
+    # The parsed cookies are kept on the request environ, so that the
+    # ``Cookie`` header is only parsed once per request no matter how many
+    # times we are called.
+    cached = environ.get(_PARSED_COOKIES_KEY)
+    if cached is not None and cached[0] == raw_cookie:
+        cookies = cached[1]
+    else:
+        cookies = parse_cookie(raw_cookie, cls=MultiDict)
+        environ[_PARSED_COOKIES_KEY] = (raw_cookie, cookies)
     return cookies.getlist(cookie_name)
@@ -5,6 +5,7 @@ import json
 from datetime import datetime, timedelta
 from pytz import timezone, UTC
 import hashlib
+import time
 from base64 import b64encode, b64decode
 import logging
 
@@ -12,7 +13,6 @@ from typing import Optional, Generator, Tuple, List
 
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.session import Session
@@ -76,7 +76,7 @@ def load(cookie: str) -> domain.Session:
     logger.debug('Load session %s for user %s at %s',
                  session_id, user_id, ip)
 
-    if expires_at <= datetime.now(tz=UTC):
+    if expires_at.timestamp() <= time.time():
         raise SessionExpired(f'Session {session_id} has expired in cookie')
 
     data: Tuple[DBUser, DBSession, DBUserNickname, DBProfile]
@@ -240,14 +240,15 @@ def invalidate_by_id(session_id: str) -> None:
         The session could not be found, or the cookie was not valid.
 
     """
-    delta = datetime.now(tz=UTC) - datetime.fromtimestamp(0, tz=EASTERN)
-    end = (delta).total_seconds()
+    end = time.time()
+    # A single UPDATE, rather than loading the session and writing it back.
     try:
-        tapir_session = _load(session_id)
-        tapir_session.end_time = end - 1
-        db.session.merge(tapir_session)
+        updated = db.session.query(DBSession) \
+            .filter(DBSession.session_id == session_id) \
+            .update({DBSession.end_time: end - 1},
+                    synchronize_session=False)
         db.session.commit()
-    except NoResultFound as e:
-        raise UnknownSession(f'No such session {session_id}') from e
     except SQLAlchemyError as e:
         raise IOError(f'Database error') from e
+    if not updated:
+        raise UnknownSession(f'No such session {session_id}')
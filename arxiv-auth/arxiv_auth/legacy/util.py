@@ -1,10 +1,11 @@
 """Helpers and Flask application integration."""
 
-from typing import Generator, List, Any
+from typing import Generator, List, Any, Mapping, Optional
 from datetime import datetime
-from pytz import timezone, UTC
+from pytz import timezone
 from contextlib import contextmanager
 import logging
+import time
 
 from flask import Flask
 from sqlalchemy import text
@@ -23,7 +24,8 @@ logger.propagate = False
 
 def now() -> int:
     """Get the current epoch/unix time."""
-    return epoch(datetime.now(tz=UTC))
+    # Same as ``epoch(datetime.now(tz=UTC))``, without the timezone math.
+    return int(round(time.time()))
 
 
 def epoch(t: datetime) -> int:
@@ -93,15 +95,16 @@ def compute_capabilities(tapir_user: DBUser) -> int:
 def get_scopes(db_user: DBUser) -> List[domain.Scope]:
     """Generate a list of authz scopes for a legacy user based on class."""
     if db_user.policy_class == DBPolicyClass.PUBLIC_USER:
-        return scopes.GENERAL_USER
+        return list(scopes.GENERAL_USER_ORDERED)
     if db_user.policy_class == DBPolicyClass.ADMIN:
         return scopes.ADMIN_USER
     return []
 
 
-def is_configured() -> bool:
+def is_configured(config: Optional[Mapping] = None) -> bool:
     """Determine whether or not the legacy auth is configured of the `Flask` app."""
-    config = get_application_config()
+    if config is None:
+        config = get_application_config()
     return not bool(missing_configs(config))
 
 def missing_configs(config) -> List[str]:
@@ -1,9 +1,9 @@
 """Tests for :mod:`arxiv.users.domain`."""
 
 from unittest import TestCase
-from datetime import datetime
+from datetime import datetime, timedelta
 from arxiv_auth.domain import Session
-from pytz import timezone
+from pytz import timezone, UTC
 from ..auth import scopes
 from .. import domain
 
@@ -58,3 +58,62 @@ class TestSession(TestCase):
 
         as_session = domain.session_from_dict(session_data)
         self.assertEqual(session, as_session)
+
+    def test_expired(self):
+        """Expiry is measured against :attr:`.Session.end_time`."""
+        now = datetime.now(tz=UTC)
+        session = domain.Session(session_id='asdf1234', start_time=now,
+                                 end_time=now + timedelta(seconds=60))
+        self.assertFalse(session.expired)
+        self.assertIn(session.expires, (59, 60))
+
+        session.end_time = now - timedelta(seconds=1)
+        self.assertTrue(session.expired)
+        self.assertEqual(session.expires, 0)
+
+        session.end_time = None
+        self.assertFalse(session.expired)
+        self.assertIsNone(session.expires)
+
+    def test_endorsements_are_categories(self):
+        """Endorsements are coerced to :class:`.Category` instances."""
+        first = domain.Authorizations(endorsements=['astro-ph.CO'])
+        second = domain.Authorizations(endorsements=['astro-ph.CO'])
+        self.assertIsInstance(first.endorsements[0], domain.Category)
+        self.assertEqual(first.endorsements, second.endorsements)
+        self.assertIs(first.endorsements[0], second.endorsements[0])
+        with self.assertRaises(ValueError):
+            domain.Authorizations(endorsements=['astro-ph.NOPE'])
+
+
+class TestScope(TestCase):
+    def test_resource_with_colons(self):
+        """A resource may itself contain colons."""
+        scope = domain.Scope('submission', 'read', 'urn:x:1')
+        self.assertEqual(scope, 'submission:read:urn:x:1')
+        self.assertEqual(scope.parts, ['submission', 'read', 'urn:x:1'])
+        self.assertEqual(scope.resource, 'urn:x:1')
+        self.assertEqual(domain.Scope.from_str(str(scope)), scope)
+        self.assertEqual(domain.Scope.from_str(str(scope)).resource,
+                         'urn:x:1')
+
+        data = {'scopes': 'submission:read:urn:x:1 submission:create'}
+        domain.Authorizations.before_init(data)
+        self.assertEqual(data['scopes'],
+                         ['submission:read:urn:x:1', 'submission:create'])
+        self.assertEqual(data['scopes'][0].resource, 'urn:x:1')
+
+    def test_for_resource_with_colons(self):
+        """Scopes on a resource with colons can be re-targeted and checked."""
+        scope = domain.Scope('submission', 'read', 'urn:x')
+        self.assertEqual(scope.as_global(), 'submission:read:*')
+        self.assertEqual(scope.for_resource('urn:y:2'),
+                         'submission:read:urn:y:2')
+
+        session = domain.Session(
+            session_id='asdf1234',
+            start_time=datetime.now(tz=UTC),
+            authorizations=domain.Authorizations(scopes=[scope])
+        )
+        self.assertTrue(session.is_authorized(scope, 'urn:x'))
+        self.assertFalse(session.is_authorized(scope, 'urn:y'))